@@ -0,0 +1,127 @@
+import csv
+import gc
+import io
+import tracemalloc
+import time
+from datetime import datetime
+
+from dim_PR_Stats import FIELDNAMES, PullRequestRecord
+from dim_deployment_frequency import MergedPullRequest
+from timestamps import format_timestamp
+
+PR_COUNT = 100000
+REPO_COUNT = 200
+AUTHOR_COUNT = 500
+
+def fake_pull_request(i):
+    # meme forme que la reponse de l'API /pulls (version reduite)
+    repo_name = f"repo-{i % REPO_COUNT}"
+    login = f"user-{i % AUTHOR_COUNT}"
+    repo = {
+        "id": i % REPO_COUNT,
+        "name": repo_name,
+        "full_name": f"owner/{repo_name}",
+        "html_url": f"https://github.com/owner/{repo_name}",
+        "url": f"https://api.github.com/repos/owner/{repo_name}",
+        "pulls_url": f"https://api.github.com/repos/owner/{repo_name}/pulls{{/number}}",
+    }
+    return {
+        "url": f"https://api.github.com/repos/owner/{repo_name}/pulls/{i}",
+        "html_url": f"https://github.com/owner/{repo_name}/pull/{i}",
+        "diff_url": f"https://github.com/owner/{repo_name}/pull/{i}.diff",
+        "patch_url": f"https://github.com/owner/{repo_name}/pull/{i}.patch",
+        "comments_url": f"https://api.github.com/repos/owner/{repo_name}/issues/{i}/comments",
+        "number": i,
+        "state": "closed",
+        "title": f"Pull request {i}",
+        "user": {"login": login, "id": i % AUTHOR_COUNT, "url": f"https://api.github.com/users/{login}"},
+        "created_at": f"2024-01-01T{i % 24:02d}:{i % 60:02d}:{i // 60 % 60:02d}Z",
+        "updated_at": f"2024-01-03T{i % 24:02d}:{i % 60:02d}:{i // 60 % 60:02d}Z",
+        "closed_at": f"2024-01-02T{i % 24:02d}:{i % 60:02d}:{i // 60 % 60:02d}Z",
+        "merged_at": f"2024-01-02T{i % 24:02d}:{i % 60:02d}:{i // 60 % 60:02d}Z",
+        "head": {"ref": "feature", "sha": f"{i:040x}", "repo": dict(repo)},
+        "base": {"ref": "main", "sha": f"{i:040x}", "repo": dict(repo)},
+    }
+
+def measure(label, build, write):
+    payload = [fake_pull_request(i) for i in range(PR_COUNT)]
+    start = time.perf_counter()
+    retained = build(payload)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    write(retained, csv.writer(io.StringIO()))
+    write_time = time.perf_counter() - start
+    del payload, retained
+
+    # memoire encore retenue une fois la reponse de l'API liberee
+    gc.collect()
+    tracemalloc.start()
+    payload = [fake_pull_request(i) for i in range(PR_COUNT)]
+    retained = build(payload)
+    del payload
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<45} {current / 1024 / 1024:8.1f} MiB {build_time:8.2f} s {write_time:8.2f} s {build_time + write_time:8.2f} s")
+    return retained
+
+def raw_json(payload):
+    # ancien chemin dim_deployment_frequency : le JSON brut est garde tel quel
+    return list(payload)
+
+def write_raw_json(prs, writer):
+    for pr in prs:
+        if pr['merged_at'] is not None:
+            created_at = datetime.strptime(pr['created_at'], '%Y-%m-%dT%H:%M:%SZ')
+            merged_at = datetime.strptime(pr['merged_at'], '%Y-%m-%dT%H:%M:%SZ')
+            time_to_merge = (merged_at - created_at).total_seconds() / (3600 * 24)
+            writer.writerow([pr['base']['repo']['id'], pr['base']['repo']['name'], pr['number'], pr['title'], pr['created_at'], pr['merged_at'], time_to_merge])
+
+def merged_records(payload):
+    return [MergedPullRequest.from_json(pr) for pr in payload if pr['merged_at'] is not None]
+
+def write_merged_records(prs, writer):
+    for pr in prs:
+        writer.writerow([0, "repo", pr.number, pr.title, format_timestamp(pr.created_at), format_timestamp(pr.merged_at), pr.time_to_merge])
+
+def stats_dicts(payload):
+    # ancien chemin dim_PR_Stats : un dict par PR
+    return [
+        {
+            'Repository ID': pr['base']['repo']['id'],
+            'Repository': pr['base']['repo']['name'],
+            'Number': pr['number'],
+            'Title': pr['title'],
+            'State': pr['state'],
+            'User': pr['user']['login'],
+            'Created At': pr['created_at'],
+            'Updated At': pr['updated_at'],
+            'Closed At': pr['closed_at'],
+            'Merged At': pr['merged_at'],
+        }
+        for pr in payload
+    ]
+
+def write_stats_dicts(prs, writer):
+    # l'ancien store_pull_requests_to_csv utilisait un DictWriter
+    dict_writer = csv.DictWriter(io.StringIO(), fieldnames=FIELDNAMES)
+    for pr in prs:
+        dict_writer.writerow(pr)
+
+def stats_records(payload):
+    return [PullRequestRecord.from_json(pr['base']['repo']['id'], pr['base']['repo']['name'], pr) for pr in payload]
+
+def write_stats_records(prs, writer):
+    for pr in prs:
+        writer.writerow(pr.to_row())
+
+def main():
+    print(f"{PR_COUNT} pull requests, {REPO_COUNT} repositories, {AUTHOR_COUNT} authors")
+    print(f"{'':<45} {'retained':>12} {'build':>10} {'write':>10} {'total':>10}")
+    measure("dim_deployment_frequency (raw JSON)", raw_json, write_raw_json)
+    measure("dim_deployment_frequency (MergedPullRequest)", merged_records, write_merged_records)
+    measure("dim_PR_Stats (dict per PR)", stats_dicts, write_stats_dicts)
+    measure("dim_PR_Stats (PullRequestRecord)", stats_records, write_stats_records)
+
+if __name__ == "__main__":
+    main()
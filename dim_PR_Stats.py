@@ -1,5 +1,6 @@
 import requests
 import csv
+import sys
 from dotenv import load_dotenv
 import os
 
@@ -8,6 +9,54 @@ load_dotenv()
 owner = os.getenv("OWNER")
 access_token = os.getenv("ACCESS_TOKEN")
 
+FIELDNAMES = ['Repository ID', 'Repository', 'Number', 'Title', 'State', 'User', 'Created At', 'Updated At', 'Closed At', 'Merged At']
+
+class PullRequestRecord:
+    # une instance par PR : pas de dict par ligne, noms de repo / auteurs / etats partages.
+    # les dates restent des chaines : elles sont ecrites telles quelles dans le CSV
+    __slots__ = ('repo_id', 'repo_name', 'number', 'title', 'state', 'user', 'created_at', 'updated_at', 'closed_at', 'merged_at')
+
+    def __init__(self, repo_id, repo_name, number, title, state, user, created_at, updated_at, closed_at, merged_at):
+        self.repo_id = repo_id
+        self.repo_name = repo_name
+        self.number = number
+        self.title = title
+        self.state = state
+        self.user = user
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.closed_at = closed_at
+        self.merged_at = merged_at
+
+    @classmethod
+    def from_json(cls, repo_id, repo_name, pr):
+        return cls(
+            repo_id,
+            sys.intern(repo_name),
+            pr['number'],
+            pr['title'],
+            sys.intern(pr['state']),
+            sys.intern(pr['user']['login']),
+            pr['created_at'],
+            pr['updated_at'],
+            pr['closed_at'],
+            pr['merged_at'],
+        )
+
+    def to_row(self):
+        return [
+            self.repo_id,
+            self.repo_name,
+            self.number,
+            self.title,
+            self.state,
+            self.user,
+            self.created_at,
+            self.updated_at,
+            self.closed_at,
+            self.merged_at,
+        ]
+
 def fetch_pull_requests(username, repo_name, repo_id):
     url = f"https://api.github.com/repos/{username}/{repo_name}/pulls"
     params = {'state': 'all'}  # pour prendre en compte les closed PR
@@ -19,19 +68,7 @@ def fetch_pull_requests(username, repo_name, repo_id):
             response.raise_for_status()  
             pull_requests = response.json()
             for pr in pull_requests:
-                pull_request_data = {
-                    'Repository ID': repo_id,  
-                    'Repository': repo_name,
-                    'Number': pr['number'],
-                    'Title': pr['title'],
-                    'State': pr['state'],
-                    'User': pr['user']['login'],
-                    'Created At': pr['created_at'],
-                    'Updated At': pr['updated_at'],
-                    'Closed At': pr['closed_at'],
-                    'Merged At': pr['merged_at'],
-                }
-                pull_requests_data.append(pull_request_data)
+                pull_requests_data.append(PullRequestRecord.from_json(repo_id, repo_name, pr))
             
             if 'next' in response.links:
                 url = response.links['next']['url']
@@ -73,20 +110,20 @@ def fetch_all_pull_requests(username, repositories):
 def store_pull_requests_to_csv(data, csv_file):
     try:
         with open(csv_file, mode='w', newline='', encoding='utf-8') as file:
-            fieldnames = ['Repository ID', 'Repository', 'Number', 'Title', 'State', 'User', 'Created At', 'Updated At', 'Closed At', 'Merged At']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(file)
+            writer.writerow(FIELDNAMES)
             for pr_data in data:
-                writer.writerow(pr_data)
+                writer.writerow(pr_data.to_row())
         print(f"Pull requests data stored in {csv_file}.")
     except IOError as e:
         print(f"Error writing to CSV file: {e}")
 
-repositories = fetch_all_repositories(owner)
+if __name__ == "__main__":
+    repositories = fetch_all_repositories(owner)
 
 
-pull_requests_data = fetch_all_pull_requests(owner, repositories)
+    pull_requests_data = fetch_all_pull_requests(owner, repositories)
 
 
-csv_file = f"dim_pull_requests_stats.csv"
-store_pull_requests_to_csv(pull_requests_data, csv_file)
+    csv_file = f"dim_pull_requests_stats.csv"
+    store_pull_requests_to_csv(pull_requests_data, csv_file)
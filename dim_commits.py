@@ -1,14 +1,34 @@
 import aiohttp
 import csv
 import asyncio
+import sys
 from dotenv import load_dotenv
 import os
+from pagination import fetch_all_pages
 
 load_dotenv()
 
 owner = os.getenv("OWNER")
 ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
 
+class CommitRecord:
+    # seuls les champs ecrits dans le CSV sont gardes, pas le JSON brut du commit
+    __slots__ = ('sha', 'author', 'message', 'date')
+
+    def __init__(self, sha, author, message, date):
+        self.sha = sha
+        self.author = author
+        self.message = message
+        self.date = date
+
+    @classmethod
+    def from_json(cls, commit):
+        author = commit["commit"]["author"]
+        return cls(commit["sha"], sys.intern(author["name"]), commit["commit"]["message"], author["date"])
+
+def commit_records(commits):
+    return [CommitRecord.from_json(commit) for commit in commits]
+
 async def fetch_all_repositories(session):
     url = f"https://api.github.com/users/{owner}/repos"
     repositories = []
@@ -28,14 +48,9 @@ async def fetch_commits(session, repo_name):
     url = f"https://api.github.com/repos/{owner}/{repo_name}/commits"
     commits_data = []
 
-    async with session.get(url, params={'per_page': 100}, headers={'Authorization': f'token {ACCESS_TOKEN}'}) as response:
-        response.raise_for_status()  
-        commits_data.extend(await response.json())
-
-    while 'next' in response.links:
-        async with session.get(response.links['next']['url'], headers={'Authorization': f'token {ACCESS_TOKEN}'}) as response:
-            response.raise_for_status()
-            commits_data.extend(await response.json())
+    pages = await fetch_all_pages(session, url, {'Authorization': f'token {ACCESS_TOKEN}'}, {'per_page': 100}, map_page=commit_records)
+    for page in pages:
+        commits_data.extend(page)
 
     return commits_data
 
@@ -45,8 +60,8 @@ async def fetch_and_store_commits():
     try:
         with open(csv_file, mode='w', newline='', encoding='utf-8') as file:
             fieldnames = ['Repository ID','Repository', 'Commit ID', 'Author', 'Message', 'Date']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(file)
+            writer.writerow(fieldnames)
 
             async with aiohttp.ClientSession() as session:
                 repositories = await fetch_all_repositories(session)
@@ -54,14 +69,7 @@ async def fetch_and_store_commits():
                 for repo in repositories:
                     commits_data = await fetch_commits(session, repo["name"])
                     for commit in commits_data:
-                        writer.writerow({
-                            'Repository ID' : repo["id"],
-                            'Repository': repo["name"],
-                            'Commit ID': commit["sha"],
-                            'Author': commit["commit"]["author"]["name"],
-                            'Date': commit["commit"]["author"]["date"],
-                            'Message': commit["commit"]["message"]
-                        })
+                        writer.writerow([repo["id"], repo["name"], commit.sha, commit.author, commit.message, commit.date])
 
         print(f"Commit details stored in {csv_file}.")
     except aiohttp.ClientError as e:
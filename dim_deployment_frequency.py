@@ -1,10 +1,11 @@
 import aiohttp
 import asyncio
 import csv
-import time
-from datetime import datetime
+import sys
 from dotenv import load_dotenv
 import os
+from pagination import MAX_CONCURRENT_PAGES, fetch_all_pages, fetch_page
+from timestamps import parse_timestamp, format_timestamp
 
 load_dotenv()
 
@@ -13,27 +14,31 @@ TARGET_ACCOUNT = os.getenv("OWNER")
 
 GITHUB_API_URL = "https://api.github.com"
 
+class MergedPullRequest:
+    # seul le strict necessaire est garde en memoire, pas le JSON brut de l'API
+    __slots__ = ("number", "title", "created_at", "merged_at")
+
+    def __init__(self, number, title, created_at, merged_at):
+        self.number = number
+        self.title = title
+        self.created_at = created_at
+        self.merged_at = merged_at
+
+    @classmethod
+    def from_json(cls, pr):
+        return cls(pr['number'], pr['title'], parse_timestamp(pr['created_at']), parse_timestamp(pr['merged_at']))
+
+    @property
+    def time_to_merge(self):
+        return (self.merged_at - self.created_at) / (3600 * 24)
+
 async def fetch_data(session, url, headers, params=None):
-    retries = 3
-    for attempt in range(retries):
-        try:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 403 and 'X-RateLimit-Reset' in response.headers:
-                    reset_time = int(response.headers['X-RateLimit-Reset'])
-                    sleep_time = max(reset_time - time.time(), 0) + 1
-                    print(f"Rate limit exceeded. Sleeping for {sleep_time} seconds.")
-                    await asyncio.sleep(sleep_time)
-                else:
-                    print(f"Request failed with status: {response.status}, {response.reason}")
-                    return None
-        except aiohttp.ClientError as e:
-            print(f"Request failed: {e}. Retrying ({attempt + 1}/{retries})")
-            if attempt == retries - 1:
-                print("Max retries exceeded")
-                return None
-        await asyncio.sleep(2)
+    try:
+        data, _ = await fetch_page(session, url, headers, params)
+        return data
+    except aiohttp.ClientError as e:
+        print(f"Request failed: {e}")
+        return None
 
 async def get_repositories(session, user, token):
     url = f"{GITHUB_API_URL}/users/{user}/repos"
@@ -49,19 +54,21 @@ async def get_repositories(session, user, token):
         page += 1
     return repositories
 
-async def get_pull_requests(session, repo, token, branch):
+def merged_pull_requests(prs):
+    return [MergedPullRequest.from_json(pr) for pr in prs if pr['merged_at'] is not None]
+
+async def get_pull_requests(session, repo, token, branch, semaphore=None):
     url = f"{GITHUB_API_URL}/repos/{repo['full_name']}/pulls"
     headers = {"Authorization": f"token {token}"}
     params = {"state": "closed", "base": branch, "per_page": 100}  
     pull_requests = []
-    page = 1
-    while True:
-        params["page"] = page
-        prs = await fetch_data(session, url, headers, params)
-        if not prs:
-            break
+    try:
+        pages = await fetch_all_pages(session, url, headers, params, map_page=merged_pull_requests, semaphore=semaphore)
+    except aiohttp.ClientError as e:
+        print(f"Failed to fetch pull requests for {repo['full_name']}. Error: {e}")
+        return pull_requests
+    for prs in pages:
         pull_requests.extend(prs)
-        page += 1
     return pull_requests
 
 async def get_branch(session, repo, token):
@@ -70,17 +77,19 @@ async def get_branch(session, repo, token):
     return await fetch_data(session, url, headers)
 
 async def get_pull_requests_for_repos(session, repositories, token):
+    # un seul semaphore pour toutes les pages de tous les repos
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
     tasks = []
     for repo in repositories:
         branch = await get_branch(session, repo, token)
         if branch:
-            task = asyncio.create_task(get_pull_requests(session, repo, token, branch['name']))
-            tasks.append((repo, task))
+            task = asyncio.create_task(get_pull_requests(session, repo, token, branch['name'], semaphore))
+            tasks.append((repo['id'], sys.intern(repo['name']), task))
     results = []
-    for repo, task in tasks:
+    for repo_id, repo_name, task in tasks:
         prs = await task
         if prs:
-            results.append((repo, prs))
+            results.append((repo_id, repo_name, prs))
     return results
 
 async def main():
@@ -93,13 +102,9 @@ async def main():
 
             repo_prs = await get_pull_requests_for_repos(session, repositories, ACCESS_TOKEN)
 
-            for repo, prs in repo_prs:
+            for repo_id, repo_name, prs in repo_prs:
                 for pr in prs:
-                    if pr['merged_at'] is not None:
-                        created_at = datetime.strptime(pr['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-                        merged_at = datetime.strptime(pr['merged_at'], '%Y-%m-%dT%H:%M:%SZ')
-                        time_to_merge = (merged_at - created_at).total_seconds() / (3600 * 24)
-                        writer.writerow([repo['id'], repo['name'], pr['number'], pr['title'], pr['created_at'], pr['merged_at'], time_to_merge])
+                    writer.writerow([repo_id, repo_name, pr.number, pr.title, format_timestamp(pr.created_at), format_timestamp(pr.merged_at), pr.time_to_merge])
 
         print("Data has been successfully written to dim_deployment_frequency.csv")
 
@@ -4,11 +4,13 @@ from datetime import datetime
 import asyncio
 from dotenv import load_dotenv
 import os
+from github_stats import fetch_commit_activity
 
 load_dotenv()
 
 owner = os.getenv("OWNER")
 ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
+METRICS_BACKEND = os.getenv("METRICS_BACKEND", "commits")
 
 async def fetch_commit_history(session, username, repo):
     url = f"https://api.github.com/repos/{username}/{repo}/commits"
@@ -44,6 +46,54 @@ def calculate_deployment_speed(commits):
     
     return average_time_between_commits_days
 
+def calculate_deployment_speed_from_activity(weeks):
+    # backend "stats" : temps moyen entre commits sur les 52 dernieres semaines (/stats/commit_activity),
+    # a la granularite du jour. Les n commits d'un meme jour sont consideres comme repartis
+    # uniformement dans la journee (instants (k + 0.5) / n), ce qui donne une valeur
+    # pour les repos dont tous les commits tombent le meme jour.
+    # Un repo avec moins de 2 commits sur ces 52 semaines n'a pas de valeur.
+    first_commit = None
+    last_commit = None
+    commits_count = 0
+    for week in weeks:
+        for day, count in enumerate(week['days']):
+            if count > 0:
+                day_start = week['week'] + day * 86400
+                if first_commit is None:
+                    first_commit = day_start + 0.5 / count * 86400
+                last_commit = day_start + (count - 0.5) / count * 86400
+                commits_count += count
+
+    if commits_count < 2:
+        return None
+
+    total_time = last_commit - first_commit
+    return total_time / (commits_count - 1) / 86400
+
+async def store_deployment_speed_from_commits(session, repos, writer):
+    repo_count = 0
+    for repo in repos:
+        commits = await fetch_commit_history(session, owner, repo["name"])
+        deployment_speed = calculate_deployment_speed(commits)
+        if deployment_speed is not None:
+            writer.writerow({'Repository ID': repo["id"], 'Repository': repo["name"], 'Deployment Speed (days)': deployment_speed})
+            repo_count += 1
+    return repo_count
+
+async def store_deployment_speed_from_stats(session, repos, writer):
+    # pas de repli sur les commits : une meme colonne ne doit pas melanger deux definitions
+    repo_count = 0
+    activities = await fetch_commit_activity(session, owner, [repo["name"] for repo in repos], {'Authorization': f'token {ACCESS_TOKEN}'})
+    for repo, weeks in zip(repos, activities):
+        if weeks is None:
+            print(f"Commit activity unavailable for {repo['name']}, skipped.")
+            continue
+        deployment_speed = calculate_deployment_speed_from_activity(weeks)
+        if deployment_speed is not None:
+            writer.writerow({'Repository ID': repo["id"], 'Repository': repo["name"], 'Deployment Speed (days)': deployment_speed})
+            repo_count += 1
+    return repo_count
+
 async def fetch_and_store_deployment_speed():
     csv_file = f"dim_deployment_speed.csv"
 
@@ -63,14 +113,10 @@ async def fetch_and_store_deployment_speed():
                         repos = await response.json()
                         if not repos:
                             break 
-                        for repo in repos:
-                            repo_name = repo["name"]
-                            repo_id = repo["id"]
-                            commits = await fetch_commit_history(session, owner, repo_name)
-                            deployment_speed = calculate_deployment_speed(commits)
-                            if deployment_speed is not None:
-                                writer.writerow({'Repository ID': repo_id,'Repository': repo_name, 'Deployment Speed (days)': deployment_speed})
-                                repo_count += 1
+                        if METRICS_BACKEND == "stats":
+                            repo_count += await store_deployment_speed_from_stats(session, repos, writer)
+                        else:
+                            repo_count += await store_deployment_speed_from_commits(session, repos, writer)
                         page += 1  
         print(f"Deployment speed stored in {csv_file}.")
     except aiohttp.ClientError as e:
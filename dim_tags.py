@@ -2,6 +2,7 @@ import requests
 import csv
 from dotenv import load_dotenv
 import os
+from pagination import fetch_all_pages_sync
 
 load_dotenv()
 
@@ -36,19 +37,14 @@ def fetch_tags(owner, repo):
     }
     tags_info = []
 
-    page = 1
-    while True:
-        params = {"per_page": 100, "page": page}
-        response = requests.get(url, params=params, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            if not data:
-                break
-            tags_info.extend(data)
-            page += 1
-        else:
-            print(f"Failed to fetch tags for {repo}. Status code: {response.status_code}")
-            break
+    try:
+        pages = fetch_all_pages_sync(url, headers, {"per_page": 100}, keep_partial=True)
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to fetch tags for {repo}. Error: {e}")
+        return tags_info
+
+    for data in pages:
+        tags_info.extend(data)
 
     return tags_info
 
@@ -3,6 +3,7 @@ import asyncio
 import csv
 from dotenv import load_dotenv
 import os
+from pagination import count_items
 
 load_dotenv()
 
@@ -50,44 +51,35 @@ async def get_repo_details(repo, token):
 async def get_commits_count(user, repo_name, token):
     url = f"https://api.github.com/repos/{user}/{repo_name}/commits"
     headers = {"Authorization": f"token {token}"}
-    commits_count = 0
-    page = 1
-    while True:
-        params = {"per_page": 100, "page": page}
-        commits_data = await fetch_data(url, headers, params)
-        if commits_data is None or len(commits_data) == 0:
-            break 
-        commits_count += len(commits_data)
-        page += 1
-    return commits_count
+    params = {"per_page": 100}
+    # pas de /stats/contributors ici : la somme des 'total' ignore les commits dont l'auteur
+    # n'est pas lie a un compte GitHub (bots, emails inconnus) et sous-estime le nombre de commits.
+    # count_items donne le compte exact en deux requetes au maximum
+    async with aiohttp.ClientSession() as session:
+        try:
+            return await count_items(session, url, headers, params)
+        except aiohttp.ClientError:
+            return 0
 
 async def get_tags_count(user, repo_name, token):
     url = f"https://api.github.com/repos/{user}/{repo_name}/tags"
     headers = {"Authorization": f"token {token}"}
-    tags_count = 0
-    page = 1
-    while True:
-        params = {"per_page": 100, "page": page}
-        tags_data = await fetch_data(url, headers, params)
-        if tags_data is None or len(tags_data) == 0:
-            break  
-        tags_count += len(tags_data)
-        page += 1
-    return tags_count
+    params = {"per_page": 100}
+    async with aiohttp.ClientSession() as session:
+        try:
+            return await count_items(session, url, headers, params)
+        except aiohttp.ClientError:
+            return 0
 
 async def get_branches_count(user, repo_name, token):
     url = f"https://api.github.com/repos/{user}/{repo_name}/branches"
     headers = {"Authorization": f"token {token}"}
-    branches_count = 0
-    page = 1
-    while True:
-        params = {"per_page": 100, "page": page}
-        branches_data = await fetch_data(url, headers, params)
-        if branches_data is None or len(branches_data) == 0:
-            break  
-        branches_count += len(branches_data)
-        page += 1
-    return branches_count
+    params = {"per_page": 100}
+    async with aiohttp.ClientSession() as session:
+        try:
+            return await count_items(session, url, headers, params)
+        except aiohttp.ClientError:
+            return 0
 
 async def main():
     user = os.getenv("OWNER")
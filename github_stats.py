@@ -0,0 +1,50 @@
+import aiohttp
+import asyncio
+from pagination import MAX_CONCURRENT_PAGES
+
+GITHUB_API_URL = "https://api.github.com"
+STATS_POLL_ATTEMPTS = 10
+STATS_POLL_DELAY = 2
+
+async def request_stats(session, url, headers, semaphore):
+    # renvoie (en_calcul, donnees) ; GitHub repond 202 tant que les statistiques sont en cours de calcul
+    async with semaphore:
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 202:
+                    return True, None
+                if response.status == 204:
+                    return False, []
+                response.raise_for_status()
+                return False, await response.json()
+        except aiohttp.ClientError as e:
+            print(f"Failed to fetch statistics from {url}. Error: {e}")
+            return False, None
+
+async def fetch_stats(session, urls, headers, concurrency=MAX_CONCURRENT_PAGES):
+    # premier passage sur toutes les urls pour que GitHub lance tous les calculs en meme temps,
+    # puis on ne redemande que celles encore en 202. Pas d'attente apres le dernier passage.
+    # None pour une url en erreur ou encore en calcul a la fin
+    semaphore = asyncio.Semaphore(concurrency)
+    results = dict.fromkeys(urls)
+    pending = list(urls)
+    for attempt in range(STATS_POLL_ATTEMPTS):
+        if attempt > 0:
+            await asyncio.sleep(STATS_POLL_DELAY * attempt)
+        responses = await asyncio.gather(*(request_stats(session, url, headers, semaphore) for url in pending))
+        computing = []
+        for url, (is_computing, data) in zip(pending, responses):
+            if is_computing:
+                computing.append(url)
+            else:
+                results[url] = data
+        pending = computing
+        if not pending:
+            break
+    for url in pending:
+        print(f"Statistics still being computed for {url}.")
+    return [results[url] for url in urls]
+
+async def fetch_commit_activity(session, user, repo_names, headers):
+    urls = [f"{GITHUB_API_URL}/repos/{user}/{repo_name}/stats/commit_activity" for repo_name in repo_names]
+    return await fetch_stats(session, urls, headers)
@@ -0,0 +1,114 @@
+import aiohttp
+import asyncio
+import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+MAX_CONCURRENT_PAGES = 8
+RETRIES = 3
+DEFAULT_PER_PAGE = 30
+
+def last_page_number(links):
+    # le header Link de la premiere page donne le numero de la derniere page
+    if 'last' not in links:
+        return 1
+    query = parse_qs(urlsplit(str(links['last']['url'])).query)
+    return int(query['page'][0])
+
+def page_params(params, page):
+    params = dict(params or {})
+    params['page'] = page
+    return params
+
+def identity(items):
+    return items
+
+async def fetch_page(session, url, headers, params):
+    for attempt in range(RETRIES):
+        try:
+            async with session.get(url, headers=headers, params=params) as response:
+                if response.status == 403 and 'X-RateLimit-Reset' in response.headers:
+                    reset_time = int(response.headers['X-RateLimit-Reset'])
+                    sleep_time = max(reset_time - time.time(), 0) + 1
+                    print(f"Rate limit exceeded. Sleeping for {sleep_time} seconds.")
+                    await asyncio.sleep(sleep_time)
+                    continue
+                response.raise_for_status()
+                return await response.json(), response.links
+        except aiohttp.ClientResponseError:
+            raise
+        except aiohttp.ClientError as e:
+            print(f"Request failed: {e}. Retrying ({attempt + 1}/{RETRIES})")
+            if attempt == RETRIES - 1:
+                raise
+            await asyncio.sleep(2)
+    raise aiohttp.ClientError(f"Max retries exceeded for {url}")
+
+async def fetch_all_pages(session, url, headers=None, params=None, map_page=identity, concurrency=MAX_CONCURRENT_PAGES, semaphore=None):
+    # page 1 en premier, puis les pages 2..last en parallele ; le resultat garde l'ordre des pages.
+    # passer le meme semaphore a plusieurs appels pour borner les requetes de tout le script
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_mapped(page):
+        async with semaphore:
+            items, links = await fetch_page(session, url, headers, page_params(params, page))
+        return map_page(items), links
+
+    first, links = await fetch_mapped(1)
+    last_page = last_page_number(links)
+    rest = await asyncio.gather(*(fetch_mapped(page) for page in range(2, last_page + 1)))
+    return [first, *(items for items, _ in rest)]
+
+async def count_items(session, url, headers=None, params=None):
+    # deux requetes au maximum : la premiere page et la derniere
+    per_page = int((params or {}).get('per_page', DEFAULT_PER_PAGE))
+    first, links = await fetch_page(session, url, headers, page_params(params, 1))
+    last_page = last_page_number(links)
+    if last_page == 1:
+        return len(first)
+    last, _ = await fetch_page(session, url, headers, page_params(params, last_page))
+    return (last_page - 1) * per_page + len(last)
+
+def fetch_page_sync(url, headers, params):
+    for attempt in range(RETRIES):
+        try:
+            response = requests.get(url, headers=headers, params=params)
+            if response.status_code == 403 and 'X-RateLimit-Reset' in response.headers:
+                reset_time = int(response.headers['X-RateLimit-Reset'])
+                sleep_time = max(reset_time - time.time(), 0) + 1
+                print(f"Rate limit exceeded. Sleeping for {sleep_time} seconds.")
+                time.sleep(sleep_time)
+                continue
+            response.raise_for_status()
+            return response.json(), response.links
+        except requests.exceptions.HTTPError:
+            raise
+        except requests.exceptions.RequestException as e:
+            print(f"Request failed: {e}. Retrying ({attempt + 1}/{RETRIES})")
+            if attempt == RETRIES - 1:
+                raise
+            time.sleep(2)
+    raise requests.exceptions.RequestException(f"Max retries exceeded for {url}")
+
+def fetch_all_pages_sync(url, headers=None, params=None, map_page=identity, concurrency=MAX_CONCURRENT_PAGES, keep_partial=False):
+    # keep_partial : si une page echoue, on garde les pages qui la precedent (comme une boucle page par page)
+    first, links = fetch_page_sync(url, headers, page_params(params, 1))
+    last_page = last_page_number(links)
+
+    def fetch_mapped(page):
+        try:
+            items, _ = fetch_page_sync(url, headers, page_params(params, page))
+        except requests.exceptions.RequestException as e:
+            if not keep_partial:
+                raise
+            print(f"Failed to fetch page {page} of {url}. Error: {e}")
+            return None
+        return map_page(items)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        rest = list(executor.map(fetch_mapped, range(2, last_page + 1)))
+    if None in rest:
+        rest = rest[:rest.index(None)]
+    return [map_page(first), *rest]
@@ -0,0 +1,15 @@
+import calendar
+import time
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def parse_timestamp(value):
+    # "2024-01-02T10:00:00Z" -> secondes depuis epoch (UTC), sans passer par strptime
+    if value is None:
+        return None
+    return calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]), int(value[11:13]), int(value[14:16]), int(value[17:19])))
+
+def format_timestamp(value):
+    if value is None:
+        return None
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(value))